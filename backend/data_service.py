@@ -2,7 +2,12 @@
 Data service for loading and analyzing prompt datasets with proper JSON serialization
 """
 
-import json
+import functools
+import hashlib
+import os
+import tempfile
+import threading
+import orjson
 import polars as pl
 import numpy as np
 from pathlib import Path
@@ -12,505 +17,531 @@ from collections import defaultdict
 import statistics
 
 
-def convert_to_json_serializable(obj):
-    """Convert polars/numpy types to JSON serializable types"""
-    if obj is None:
-        return None
-    elif isinstance(obj, datetime):
-        return obj.strftime("%Y-%m-%dT%H:%M:%S")
-    elif isinstance(obj, (np.integer)):
-        return int(obj)
-    elif isinstance(obj, (np.floating)):
-        val = float(obj)
-        return val if not (np.isnan(val) or np.isinf(val)) else None
-    elif isinstance(obj, (int, float)):
-        # Handle regular Python int/float
-        if isinstance(obj, float) and (np.isnan(obj) or np.isinf(obj)):
-            return None
-        return obj
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif hasattr(obj, "item") and not isinstance(
-        obj, (int, float)
-    ):  # polars scalar only
-        try:
-            val = obj.item()
-            if isinstance(val, float) and (np.isnan(val) or np.isinf(val)):
-                return None
-            return val
-        except (ValueError, AttributeError):
-            return str(obj)
-    else:
-        return obj
+# Source datasets, in the order their records are concatenated
+DATA_FILES = (
+    "prompts.jsonl",
+    "recent_prompts.jsonl",
+    "expanded_prompts.jsonl",
+    "expanded_prompts_2.jsonl",
+)
+
+# Timestamp layout mandated by data/schema.json (YYYY-MM-DDTHH:mm:ssZ)
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S%#z"
+
+# Periods get_temporal_analysis can bucket by
+TEMPORAL_PERIODS = ("hourly", "daily", "weekly")
+
+# Maximum number of memoized endpoint results
+RESULT_CACHE_SIZE = 64
+
+# Upper bounds (inclusive) of the Poor/Fair/Good bins; anything above is
+# Excellent
+QUALITY_BIN_EDGES = (2.0, 3.0, 4.0)
+QUALITY_BIN_LABELS = ("Poor", "Fair", "Good", "Excellent")
+
+# Bump when the derived columns change so stale Parquet caches are ignored
+CACHE_VERSION = 3
+
+# ISO 8601 layout of the first/last prompt timestamps in responses
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S%:z"
+
+# Decimal places each query's float columns are displayed with. They are
+# rounded with Python's round() on the collected rows, which rounds the exact
+# binary value; polars' Expr.round can differ in the last displayed digit for
+# values whose float lies just beside a .5 boundary
+DISPLAY_DECIMALS = {
+    "users": {
+        "avg_tokens": 1,
+        "avg_quality": 2,
+        "avg_prompt_length": 1,
+        "total_cost": 3,
+    },
+    "models": {
+        "avg_tokens": 1,
+        "avg_quality": 2,
+        "avg_response_time": 0,
+        "total_cost": 3,
+        "usage_percentage": 1,
+    },
+    "categories": {
+        "avg_tokens": 1,
+        "avg_quality": 2,
+        "avg_prompt_length": 1,
+        "usage_percentage": 1,
+    },
+    **{period: {"avg_quality": 2} for period in TEMPORAL_PERIODS},
+    "overview": {"avg_quality": 2, "total_cost": 2},
+    "quality": {"avg_quality": 2, "quality_std": 2, "avg_prompt_length": 1},
+}
+
+# Low-cardinality string columns used as group-by keys
+CATEGORICAL_COLUMNS = ("user_id", "user", "model", "category", "day_of_week")
+
+# Integer counts stored at 32 bits to halve the bytes each aggregation scans;
+# sums over them are widened back to 64 bits (see total_tokens)
+INT32_COLUMNS = ("tokens_used", "response_time_ms")
+
+
+def filled(value: pl.Expr) -> pl.Expr:
+    """An aggregate for display, 0.0 when it is missing or NaN"""
+    return value.fill_nan(None).fill_null(0.0)
+
+
+def filled_mean(column: str) -> pl.Expr:
+    """Mean of a column for display, 0.0 when undefined"""
+    return filled(pl.col(column).mean())
+
+
+def round_rows(
+    rows: List[Dict[str, Any]], decimals: Dict[str, int]
+) -> List[Dict[str, Any]]:
+    """Round the float columns of response rows in place for display"""
+    for row in rows:
+        for column, places in decimals.items():
+            if row.get(column) is not None:
+                row[column] = round(row[column], places)
+    return rows
+
+
+def total_tokens() -> pl.Expr:
+    """Sum of tokens_used, widened so the 32-bit column cannot overflow"""
+    return pl.col("tokens_used").cast(pl.Int64).sum()
+
+
+def most_common(values: pl.Expr) -> pl.Expr:
+    """Most frequent value of an expression as a string, "N/A" when empty"""
+    return values.mode().first().cast(pl.String).fill_null("N/A")
+
+
+def cached_result(method):
+    """Memoize an aggregation result until the datasets are reloaded"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        # Handlers run in the threadpool, so guard the shared cache dict
+        with self.result_cache_lock:
+            if key in self.result_cache:
+                return self.result_cache[key]
+        result = method(self, *args, **kwargs)
+        with self.result_cache_lock:
+            # Arguments such as `limit` come from the query string, so bound
+            # the cache by evicting the oldest entry
+            while len(self.result_cache) >= RESULT_CACHE_SIZE:
+                del self.result_cache[next(iter(self.result_cache))]
+            self.result_cache[key] = result
+        return result
+
+    return wrapper
 
 
 class PromptDataService:
     def __init__(self, data_dir: str = "../data"):
         self.data_dir = Path(data_dir)
         self.df = None
+        self.result_cache: Dict[tuple, Any] = {}
+        self.result_cache_lock = threading.Lock()
+        self.aggregates: Dict[str, List[Dict[str, Any]]] = {}
         self.load_data()
 
-    def load_jsonl(self, filepath: Path) -> List[Dict]:
-        """Load JSON Lines file into a list of dictionaries"""
-        data = []
+    def scan_jsonl(self, filepath: Path) -> Optional[pl.LazyFrame]:
+        """Lazily scan a JSON Lines file"""
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                for line in f:
-                    data.append(json.loads(line.strip()))
+            if filepath.stat().st_size == 0:
+                return None
         except FileNotFoundError:
             print(f"Warning: {filepath} not found")
-            return []
-        return data
+            return None
+        # Scan the whole file for the schema; some fields are optional
+        return pl.scan_ndjson(filepath, infer_schema_length=None)
 
-    def load_data(self):
-        """Load all prompt datasets"""
-        prompts_data = self.load_jsonl(self.data_dir / "prompts.jsonl")
-        recent_data = self.load_jsonl(self.data_dir / "recent_prompts.jsonl")
-        expanded_data = self.load_jsonl(self.data_dir / "expanded_prompts.jsonl")
-        expanded_data_2 = self.load_jsonl(self.data_dir / "expanded_prompts_2.jsonl")
+    def get_cache_path(self, files: List[Path]) -> Path:
+        """Get the Parquet cache path keyed by source file mtimes and sizes"""
+        parts = [f"v{CACHE_VERSION}"]
+        for path in files:
+            try:
+                stat = path.stat()
+                parts.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}")
+            except FileNotFoundError:
+                parts.append(f"{path}:missing")
+        key = hashlib.blake2b(";".join(parts).encode()).hexdigest()[:16]
+        return self.data_dir / f".cache_{key}.parquet"
+
+    def write_cache(self, cache_path: Path):
+        """Persist the processed DataFrame and drop stale cache files"""
+        try:
+            for stale in self.data_dir.glob(".cache_*.parquet"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+            # Write beside the cache and rename it into place so a crash or a
+            # concurrent reader never sees a partially written file
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.data_dir, prefix=".cache_tmp_", suffix=".tmp"
+            )
+            os.close(fd)
+            try:
+                self.df.write_parquet(tmp_name, compression="zstd")
+                os.replace(tmp_name, cache_path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            print(f"Warning: could not write cache {cache_path}: {e}")
+
+    def prepare_frame(self, raw: pl.LazyFrame, timestamp_format: str) -> pl.LazyFrame:
+        """Add the parsed timestamp and derived columns to the raw records"""
+        prepared = raw.with_columns(
+            [
+                pl.col("timestamp").str.to_datetime(
+                    format=timestamp_format, time_zone="UTC", cache=True
+                ),
+                pl.col("prompt").str.len_chars().alias("prompt_length"),
+            ]
+        ).with_columns(
+            [
+                pl.col("timestamp").dt.date().alias("date"),
+                pl.col("timestamp").dt.hour().alias("hour"),
+                pl.col("timestamp").dt.strftime("%A").alias("day_of_week"),
+                pl.col("timestamp").dt.strftime("%Y-W%U").alias("week"),
+            ]
+        )
 
-        all_data = prompts_data + recent_data + expanded_data + expanded_data_2
+        # Group-by keys hash faster as categorical codes than as strings,
+        # and narrower integers mean less memory traffic per aggregation
+        columns = prepared.collect_schema().names()
+        return prepared.with_columns(
+            [
+                pl.col(col).cast(pl.Categorical)
+                for col in CATEGORICAL_COLUMNS
+                if col in columns
+            ]
+            + [pl.col(col).cast(pl.Int32) for col in INT32_COLUMNS if col in columns]
+        )
 
-        if all_data:
-            self.df = pl.DataFrame(all_data)
+    def load_data(self):
+        """Load all prompt datasets"""
+        with self.result_cache_lock:
+            self.result_cache.clear()
+        files = [self.data_dir / name for name in DATA_FILES]
+        cache_path = self.get_cache_path(files)
+        if cache_path.exists():
+            try:
+                self.df = pl.read_parquet(cache_path)
+            except Exception as e:
+                # A truncated or corrupt cache is rebuilt from the datasets
+                print(f"Warning: could not read cache {cache_path}: {e}")
+                cache_path.unlink(missing_ok=True)
+            else:
+                print(f"Loaded {len(self.df)} records from cache")
+                self.build_aggregates()
+                return
+
+        frames = [frame for frame in map(self.scan_jsonl, files) if frame is not None]
+
+        if frames:
+            # Files may lack optional columns or disagree on numeric widths
+            raw = pl.concat(frames, how="diagonal_relaxed")
+            try:
+                self.df = self.prepare_frame(raw, TIMESTAMP_FORMAT).collect()
+            except pl.exceptions.InvalidOperationError:
+                # Timestamps that are not in the schema's fixed layout (e.g.
+                # with fractional seconds) need the general ISO 8601 parser
+                self.df = self.prepare_frame(raw, "%+").collect()
             print(f"Loaded {len(self.df)} records")
             print(f"Available columns: {list(self.df.columns)}")
+            self.write_cache(cache_path)
 
-            # Convert timestamp to datetime and add derived columns
-            self.df = self.df.with_columns(
-                [
-                    pl.col("timestamp")
-                    .str.to_datetime(format="%+", time_zone="UTC")
-                    .alias("timestamp"),
-                    pl.col("prompt").str.len_chars().alias("prompt_length"),
-                ]
-            ).with_columns(
-                [
-                    pl.col("timestamp").dt.date().alias("date"),
-                    pl.col("timestamp").dt.hour().alias("hour"),
-                    pl.col("timestamp").dt.strftime("%A").alias("day_of_week"),
-                ]
-            )
-
-    def get_overview_stats(self) -> Dict[str, Any]:
-        """Get overview statistics"""
-        if self.df is None or len(self.df) == 0:
-            return {}
+        self.build_aggregates()
 
-        # Get min/max timestamps
-        min_timestamp = self.df["timestamp"].min()
-        max_timestamp = self.df["timestamp"].max()
+    def build_aggregates(self):
+        """Precompute every aggregation the endpoints serve
 
-        # Get aggregated values
-        avg_quality_val = self.df["response_quality"].mean()
-        avg_quality = convert_to_json_serializable(avg_quality_val)
+        The per-user, per-model, per-category and temporal group-bys and the
+        overview and quality selects are collected in one parallel pass,
+        filled and formatted with polars expressions, rounded for display in
+        Python (see DISPLAY_DECIMALS), and stored as response rows (group-bys
+        sorted by descending prompt_count, or by period for the temporal
+        buckets), so the endpoints only slice and pack them.
+        """
+        self.aggregates = {}
+        if self.df is None or len(self.df) == 0:
+            return
 
-        total_cost_val = (
-            self.df["cost_usd"].sum() if "cost_usd" in self.df.columns else 0
-        )
-        total_cost = convert_to_json_serializable(total_cost_val)
+        # Pick up the user name in the same pass instead of re-filtering
+        if "user" in self.df.columns:
+            user_name = pl.col("user").first().cast(pl.String)
+        else:
+            user_name = pl.lit(None, dtype=pl.String)
 
-        return {
-            "total_prompts": int(len(self.df)),
-            "unique_users": int(self.df["user_id"].n_unique()),
-            "date_range": {
-                "start": str(min_timestamp).replace(" ", "T")
-                if min_timestamp is not None
-                else "",
-                "end": str(max_timestamp).replace(" ", "T")
-                if max_timestamp is not None
-                else "",
-            },
-            "total_tokens": int(self.df["tokens_used"].sum()),
-            "avg_quality": round(float(avg_quality), 2)
-            if avg_quality is not None and isinstance(avg_quality, (int, float))
-            else 0.0,
-            "total_cost": round(float(total_cost), 2)
-            if total_cost is not None and isinstance(total_cost, (int, float))
-            else 0.0,
-        }
+        # Optional columns default to zero when they are missing
+        if "cost_usd" in self.df.columns:
+            total_cost = filled(pl.col("cost_usd").sum())
+        else:
+            total_cost = pl.lit(0.0)
 
-    def get_user_aggregations(self, limit: int = 10) -> Dict[str, Any]:
-        """Get aggregated statistics by user_id"""
-        if self.df is None or len(self.df) == 0:
-            return {}
+        if "response_time_ms" in self.df.columns:
+            avg_response_time = filled_mean("response_time_ms")
+        else:
+            avg_response_time = pl.lit(0.0)
 
-        # Create aggregation using polars
-        agg_cols = [
+        user_cols = [
+            user_name.alias("user_name"),
+            pl.col("prompt").count().alias("prompt_count"),
+            total_tokens().alias("total_tokens"),
+            filled_mean("tokens_used").alias("avg_tokens"),
+            filled_mean("response_quality").alias("avg_quality"),
+            filled_mean("prompt_length").alias("avg_prompt_length"),
+            pl.col("timestamp").min().dt.strftime(ISO_FORMAT).alias("first_prompt"),
+            pl.col("timestamp").max().dt.strftime(ISO_FORMAT).alias("last_prompt"),
+            total_cost.alias("total_cost"),
+        ]
+        model_cols = [
             pl.col("prompt").count().alias("prompt_count"),
-            pl.col("tokens_used").sum().alias("tokens_used_sum"),
-            pl.col("tokens_used").mean().alias("tokens_used_mean"),
-            pl.col("response_quality").mean().alias("response_quality_mean"),
-            pl.col("prompt_length").mean().alias("prompt_length_mean"),
-            pl.col("timestamp").min().alias("timestamp_min"),
-            pl.col("timestamp").max().alias("timestamp_max"),
+            total_tokens().alias("total_tokens"),
+            filled_mean("tokens_used").alias("avg_tokens"),
+            filled_mean("response_quality").alias("avg_quality"),
+            avg_response_time.alias("avg_response_time"),
+            total_cost.alias("total_cost"),
+        ]
+        category_cols = [
+            pl.col("prompt").count().alias("prompt_count"),
+            filled_mean("tokens_used").alias("avg_tokens"),
+            filled_mean("response_quality").alias("avg_quality"),
+            filled_mean("prompt_length").alias("avg_prompt_length"),
         ]
 
-        # Add cost_usd aggregation if column exists
-        if "cost_usd" in self.df.columns:
-            agg_cols.append(pl.col("cost_usd").sum().alias("cost_usd_sum"))
+        user_name_fallback = (
+            pl.when(
+                pl.col("user_name").is_null()
+                | pl.col("user_name").str.to_lowercase().is_in(["nan", "none"])
+            )
+            .then(pl.format("User {}", pl.col("user_id")))
+            .otherwise(pl.col("user_name"))
+            .alias("user_name")
+        )
+        usage_percentage = (
+            (pl.col("prompt_count") / len(self.df) * 100).alias("usage_percentage")
+        )
 
-        user_stats = (
-            self.df.group_by("user_id")
+        lazy_df = self.df.lazy()
+        queries = {
+            name: lazy_df.group_by(key, maintain_order=False)
             .agg(agg_cols)
+            .with_columns(derived_col)
             .sort("prompt_count", descending=True)
-            .head(limit)
-        )
-
-        # Convert to list of dictionaries
-        result = []
-        for row in user_stats.iter_rows(named=True):
-            user_id = row["user_id"]
-
-            # Get user name for this user_id
-            try:
-                if "user" in self.df.columns:
-                    user_name_row = (
-                        self.df.filter(pl.col("user_id") == user_id)
-                        .select("user")
-                        .head(1)
-                    )
-                    if len(user_name_row) > 0:
-                        user_name_value = user_name_row.item(0, 0)
-                        if user_name_value is None or str(user_name_value).lower() in [
-                            "nan",
-                            "none",
-                        ]:
-                            user_name = f"User {user_id}"
-                        else:
-                            user_name = str(user_name_value)
-                    else:
-                        user_name = f"User {user_id}"
-                else:
-                    user_name = f"User {user_id}"
-            except Exception:
-                # Fallback if anything goes wrong
-                user_name = f"User {user_id}"
-
-            avg_tokens = convert_to_json_serializable(row["tokens_used_mean"])
-            avg_quality = convert_to_json_serializable(row["response_quality_mean"])
-            avg_prompt_length = convert_to_json_serializable(row["prompt_length_mean"])
-
-            result.append(
-                {
-                    "user_id": str(user_id),
-                    "user_name": str(user_name),
-                    "prompt_count": convert_to_json_serializable(row["prompt_count"]),
-                    "total_tokens": convert_to_json_serializable(
-                        row["tokens_used_sum"]
-                    ),
-                    "avg_tokens": round(float(avg_tokens), 1)
-                    if avg_tokens is not None
-                    else 0.0,
-                    "avg_quality": round(float(avg_quality), 2)
-                    if avg_quality is not None
-                    else 0.0,
-                    "avg_prompt_length": round(float(avg_prompt_length), 1)
-                    if avg_prompt_length is not None
-                    else 0.0,
-                    "first_prompt": str(row["timestamp_min"]).replace(" ", "T"),
-                    "last_prompt": str(row["timestamp_max"]).replace(" ", "T"),
-                    "total_cost": round(float(row.get("cost_usd_sum", 0)), 3)
-                    if "cost_usd_sum" in row and row.get("cost_usd_sum") is not None
-                    else 0.0,
-                }
+            for name, key, agg_cols, derived_col in (
+                ("users", "user_id", user_cols, user_name_fallback),
+                ("models", "model", model_cols, usage_percentage),
+                ("categories", "category", category_cols, usage_percentage),
             )
+        }
+        for period in TEMPORAL_PERIODS:
+            queries[period] = self.temporal_query(lazy_df, period)
+        queries["overview"] = self.overview_query(lazy_df)
+        queries["quality"] = self.quality_query(lazy_df)
+
+        # Run all group-bys together on polars' thread pool
+        frames = pl.collect_all(list(queries.values()))
+        self.aggregates = {
+            name: round_rows(frame.to_dicts(), DISPLAY_DECIMALS[name])
+            for name, frame in zip(queries, frames)
+        }
 
-        return {"users": result, "total_users": int(self.df["user_id"].n_unique())}
-
-    def get_temporal_analysis(self, period: str = "daily") -> Dict[str, Any]:
-        """Get temporal analysis by different time periods"""
-        if self.df is None or len(self.df) == 0:
-            return {}
+    def temporal_query(self, lazy_df: pl.LazyFrame, period: str) -> pl.LazyFrame:
+        """Build the formatted, period-sorted group-by for one time period"""
+        agg_cols = [
+            pl.col("prompt").count().alias("prompt_count"),
+            total_tokens().alias("total_tokens"),
+            pl.col("response_quality").mean().alias("avg_quality"),
+        ]
 
         if period == "hourly":
             # Group by hour of day
-            temporal_data = (
-                self.df.group_by("hour")
-                .agg(
-                    [
-                        pl.col("prompt").count().alias("prompt_count"),
-                        pl.col("tokens_used").sum().alias("tokens_used"),
-                        pl.col("response_quality").mean().alias("response_quality"),
-                    ]
-                )
-                .sort("hour")
-            )
-
-            result = []
-            for row in temporal_data.iter_rows(named=True):
-                result.append(
-                    {
-                        "period": f"{row['hour']:02d}:00",
-                        "period_value": row["hour"],
-                        "prompt_count": int(row["prompt_count"]),
-                        "total_tokens": int(row["tokens_used"]),
-                        "avg_quality": round(float(row["response_quality"]), 2),
-                    }
-                )
+            key = "hour"
+            period_col = pl.format("{}:00", pl.col("hour").cast(pl.String).str.zfill(2))
+            period_value_col = pl.col("hour")
 
         elif period == "daily":
             # Group by date
-            temporal_data = (
-                self.df.group_by("date")
-                .agg(
-                    [
-                        pl.col("prompt").count().alias("prompt_count"),
-                        pl.col("tokens_used").sum().alias("tokens_used"),
-                        pl.col("response_quality").mean().alias("response_quality"),
-                        pl.col("user_id").n_unique().alias("user_id"),
-                    ]
-                )
-                .sort("date")
-            )
-
-            result = []
-            for row in temporal_data.iter_rows(named=True):
-                date_obj = row["date"]
-                date_str = (
-                    date_obj.strftime("%Y-%m-%d")
-                    if hasattr(date_obj, "strftime")
-                    else str(date_obj)
-                )
-                result.append(
-                    {
-                        "period": date_str,
-                        "period_value": date_str,
-                        "prompt_count": int(row["prompt_count"]),
-                        "total_tokens": int(row["tokens_used"]),
-                        "avg_quality": round(float(row["response_quality"]), 2),
-                        "unique_users": int(row["user_id"]),
-                    }
-                )
+            key = "date"
+            period_value_col = pl.col("date").dt.strftime("%Y-%m-%d")
+            period_col = period_value_col
+            agg_cols.append(pl.col("user_id").n_unique().alias("unique_users"))
 
         elif period == "weekly":
-            # Group by week - we'll use a different approach for polars
-            df_with_week = self.df.with_columns(
-                [pl.col("timestamp").dt.strftime("%Y-W%U").alias("week")]
+            # Group by the week column precomputed in load_data
+            key = "week"
+            period_col = pl.format("Week of {}", pl.col("week"))
+            period_value_col = pl.col("week")
+            agg_cols.append(pl.col("user_id").n_unique().alias("unique_users"))
+
+        # Each period's groups are sorted by the period key
+        return (
+            lazy_df.group_by(key, maintain_order=False)
+            .agg(agg_cols)
+            .sort(key)
+            .select(
+                period_col.alias("period"),
+                period_value_col.alias("period_value"),
+                pl.exclude(key),
             )
+        )
 
-            temporal_data = (
-                df_with_week.group_by("week")
-                .agg(
-                    [
-                        pl.col("prompt").count().alias("prompt_count"),
-                        pl.col("tokens_used").sum().alias("tokens_used"),
-                        pl.col("response_quality").mean().alias("response_quality"),
-                        pl.col("user_id").n_unique().alias("user_id"),
-                    ]
-                )
-                .sort("week")
-            )
+    def overview_query(self, lazy_df: pl.LazyFrame) -> pl.LazyFrame:
+        """Build the single-row select of formatted overview values"""
+        return lazy_df.select(
+            [
+                pl.len().alias("total_prompts"),
+                pl.col("user_id").n_unique().alias("unique_users"),
+                pl.col("timestamp")
+                .min()
+                .dt.strftime(ISO_FORMAT)
+                .fill_null("")
+                .alias("start"),
+                pl.col("timestamp")
+                .max()
+                .dt.strftime(ISO_FORMAT)
+                .fill_null("")
+                .alias("end"),
+                total_tokens().alias("total_tokens"),
+                filled_mean("response_quality").alias("avg_quality"),
+                filled(pl.col("cost_usd").sum()).alias("total_cost")
+                if "cost_usd" in self.df.columns
+                else pl.lit(0.0).alias("total_cost"),
+            ]
+        )
 
-            result = []
-            for row in temporal_data.iter_rows(named=True):
-                week_str = row["week"]
-                result.append(
-                    {
-                        "period": f"Week of {week_str}",
-                        "period_value": week_str,
-                        "prompt_count": int(row["prompt_count"]),
-                        "total_tokens": int(row["tokens_used"]),
-                        "avg_quality": round(float(row["response_quality"]), 2),
-                        "unique_users": int(row["user_id"]),
-                    }
-                )
+    def quality_query(self, lazy_df: pl.LazyFrame) -> pl.LazyFrame:
+        """Build the single-row select of overall and low quality statistics"""
+        # The low-quality rows are filtered per expression instead of being
+        # materialized as a separate frame
+        low_quality = pl.col("response_quality") < 3.0
+        return lazy_df.select(
+            [
+                filled_mean("response_quality").alias("avg_quality"),
+                filled(pl.col("response_quality").std()).alias("quality_std"),
+                low_quality.sum().alias("low_quality_count"),
+                filled(pl.col("prompt_length").filter(low_quality).mean()).alias(
+                    "avg_prompt_length"
+                ),
+                most_common(pl.col("category").filter(low_quality)).alias(
+                    "most_common_category"
+                ),
+                most_common(pl.col("model").filter(low_quality)).alias(
+                    "most_common_model"
+                ),
+            ]
+        )
+
+    @cached_result
+    def get_overview_stats(self) -> Dict[str, Any]:
+        """Get overview statistics"""
+        if self.df is None or len(self.df) == 0:
+            return {}
+
+        # Overview values are precomputed in build_aggregates
+        stats = self.aggregates["overview"][0]
 
         return {
-            "period_type": period,
-            "data": sorted(result, key=lambda x: x["period_value"]),
+            "total_prompts": stats["total_prompts"],
+            "unique_users": stats["unique_users"],
+            "date_range": {"start": stats["start"], "end": stats["end"]},
+            "total_tokens": stats["total_tokens"],
+            "avg_quality": stats["avg_quality"],
+            "total_cost": stats["total_cost"],
         }
 
-    def get_model_performance(self) -> Dict[str, Any]:
-        """Get model performance analysis"""
+    @cached_result
+    def get_user_aggregations(self, limit: int = 10) -> Dict[str, Any]:
+        """Get aggregated statistics by user_id"""
         if self.df is None or len(self.df) == 0:
             return {}
 
-        agg_cols = [
-            pl.col("prompt").count().alias("prompt_count"),
-            pl.col("tokens_used").sum().alias("tokens_used_sum"),
-            pl.col("tokens_used").mean().alias("tokens_used_mean"),
-            pl.col("response_quality").mean().alias("response_quality_mean"),
-        ]
-
-        # Add optional columns if they exist
-        if "response_time_ms" in self.df.columns:
-            agg_cols.append(
-                pl.col("response_time_ms").mean().alias("response_time_ms_mean")
-            )
+        # Slice the top users out of the precomputed, sorted aggregation
+        return {
+            "users": self.aggregates["users"][:limit],
+            "total_users": len(self.aggregates["users"]),
+        }
 
-        if "cost_usd" in self.df.columns:
-            agg_cols.append(pl.col("cost_usd").sum().alias("cost_usd_sum"))
+    @cached_result
+    def get_temporal_analysis(self, period: str = "daily") -> Dict[str, Any]:
+        """Get temporal analysis by different time periods"""
+        if self.df is None or len(self.df) == 0:
+            return {}
 
-        model_stats = (
-            self.df.group_by("model")
-            .agg(agg_cols)
-            .sort("prompt_count", descending=True)
-        )
+        # Buckets are precomputed in build_aggregates
+        return {
+            "period_type": period,
+            "data": self.aggregates[period],
+        }
 
-        result = []
-        total_prompts = len(self.df)
-        for row in model_stats.iter_rows(named=True):
-            # Convert values safely using our converter
-            avg_tokens = convert_to_json_serializable(row["tokens_used_mean"])
-            avg_quality = convert_to_json_serializable(row["response_quality_mean"])
-            avg_response_time = convert_to_json_serializable(
-                row.get("response_time_ms_mean")
-            )
-            total_cost = convert_to_json_serializable(row.get("cost_usd_sum"))
-
-            result.append(
-                {
-                    "model": row["model"],
-                    "prompt_count": int(row["prompt_count"]),
-                    "total_tokens": int(row["tokens_used_sum"]),
-                    "avg_tokens": round(float(avg_tokens), 1)
-                    if avg_tokens is not None and isinstance(avg_tokens, (int, float))
-                    else 0.0,
-                    "avg_quality": round(float(avg_quality), 2)
-                    if avg_quality is not None and isinstance(avg_quality, (int, float))
-                    else 0.0,
-                    "avg_response_time": round(float(avg_response_time), 0)
-                    if avg_response_time is not None
-                    and isinstance(avg_response_time, (int, float))
-                    else 0.0,
-                    "total_cost": round(float(total_cost), 3)
-                    if total_cost is not None and isinstance(total_cost, (int, float))
-                    else 0.0,
-                    "usage_percentage": round(
-                        (row["prompt_count"] / total_prompts) * 100, 1
-                    ),
-                }
-            )
+    @cached_result
+    def get_model_performance(self) -> Dict[str, Any]:
+        """Get model performance analysis"""
+        if self.df is None or len(self.df) == 0:
+            return {}
 
-        return {"models": result}
+        return {"models": self.aggregates["models"]}
 
+    @cached_result
     def get_category_analysis(self) -> Dict[str, Any]:
         """Get category analysis"""
         if self.df is None or len(self.df) == 0:
             return {}
 
-        category_stats = (
-            self.df.group_by("category")
-            .agg(
-                [
-                    pl.col("prompt").count().alias("prompt_count"),
-                    pl.col("tokens_used").mean().alias("tokens_used"),
-                    pl.col("response_quality").mean().alias("response_quality"),
-                    pl.col("prompt_length").mean().alias("prompt_length"),
-                ]
-            )
-            .sort("prompt_count", descending=True)
-        )
-
-        result = []
-        total_prompts = len(self.df)
-        for row in category_stats.iter_rows(named=True):
-            result.append(
-                {
-                    "category": row["category"],
-                    "prompt_count": int(row["prompt_count"]),
-                    "avg_tokens": round(float(row["tokens_used"]), 1),
-                    "avg_quality": round(float(row["response_quality"]), 2),
-                    "avg_prompt_length": round(float(row["prompt_length"]), 1),
-                    "usage_percentage": round(
-                        (row["prompt_count"] / total_prompts) * 100, 1
-                    ),
-                }
-            )
-
-        return {"categories": result}
+        return {"categories": self.aggregates["categories"]}
 
+    @cached_result
     def get_quality_insights(self) -> Dict[str, Any]:
         """Get quality insights and patterns"""
         if self.df is None or len(self.df) == 0:
             return {}
 
-        # Quality distribution using polars cut-like functionality
-        df_with_quality_bins = self.df.with_columns(
-            [
-                pl.when(pl.col("response_quality") <= 2.0)
-                .then(pl.lit("Poor"))
-                .when(pl.col("response_quality") <= 3.0)
-                .then(pl.lit("Fair"))
-                .when(pl.col("response_quality") <= 4.0)
-                .then(pl.lit("Good"))
-                .otherwise(pl.lit("Excellent"))
-                .alias("quality_bin")
-            ]
-        )
-
-        quality_dist = (
-            df_with_quality_bins.group_by("quality_bin")
-            .agg(pl.count().alias("count"))
-            .to_dict(as_series=False)
+        # Quality distribution: bucket scores with one vectorized digitize
+        # pass (NaN and missing scores fall into the last bin, "Excellent")
+        codes = np.digitize(
+            self.df["response_quality"].to_numpy(), QUALITY_BIN_EDGES, right=True
         )
+        counts = np.bincount(codes, minlength=len(QUALITY_BIN_LABELS))
 
-        # Convert to dictionary
+        # Convert to dictionary, leaving out empty bins
         quality_distribution = {
-            bin_name: count
-            for bin_name, count in zip(
-                quality_dist["quality_bin"], quality_dist["count"]
-            )
+            bin_name: int(count)
+            for bin_name, count in zip(QUALITY_BIN_LABELS, counts)
+            if count > 0
         }
 
-        # Low quality analysis
-        low_quality = self.df.filter(pl.col("response_quality") < 3.0)
-
-        # Get statistics
-        avg_quality_val = self.df["response_quality"].mean()
-        quality_std_val = self.df["response_quality"].std()
-
-        # Convert to python types safely using our converter
-        avg_quality = convert_to_json_serializable(avg_quality_val)
-        quality_std = convert_to_json_serializable(quality_std_val)
+        # Overall and low quality statistics are precomputed in
+        # build_aggregates
+        stats = self.aggregates["quality"][0]
 
         insights = {
             "quality_distribution": quality_distribution,
-            "avg_quality": round(float(avg_quality), 2)
-            if avg_quality is not None and isinstance(avg_quality, (int, float))
-            else 0.0,
-            "quality_std": round(float(quality_std), 2)
-            if quality_std is not None and isinstance(quality_std, (int, float))
-            else 0.0,
-            "low_quality_count": len(low_quality),
+            "avg_quality": stats["avg_quality"],
+            "quality_std": stats["quality_std"],
+            "low_quality_count": stats["low_quality_count"],
             "low_quality_characteristics": {},
         }
 
-        if len(low_quality) > 0:
-            # Get most common category and model for low quality
-            most_common_category = (
-                low_quality.group_by("category")
-                .agg(pl.count().alias("count"))
-                .sort("count", descending=True)
-                .head(1)
-            )
-
-            most_common_model = (
-                low_quality.group_by("model")
-                .agg(pl.count().alias("count"))
-                .sort("count", descending=True)
-                .head(1)
-            )
-
-            avg_prompt_length_val = low_quality["prompt_length"].mean()
-            avg_prompt_length = convert_to_json_serializable(avg_prompt_length_val)
-
+        if stats["low_quality_count"] > 0:
             insights["low_quality_characteristics"] = {
-                "avg_prompt_length": round(float(avg_prompt_length), 1)
-                if avg_prompt_length is not None
-                and isinstance(avg_prompt_length, (int, float))
-                else 0.0,
-                "most_common_category": most_common_category.item(0, 0)
-                if len(most_common_category) > 0
-                else "N/A",
-                "most_common_model": most_common_model.item(0, 0)
-                if len(most_common_model) > 0
-                else "N/A",
+                "avg_prompt_length": stats["avg_prompt_length"],
+                "most_common_category": stats["most_common_category"],
+                "most_common_model": stats["most_common_model"],
             }
 
         return insights
 
+    @cached_result
+    def get_payload(self, method: str, **kwargs) -> bytes:
+        """Get the result of a get_* method serialized to JSON bytes"""
+        # Cached like the results themselves, so repeated requests skip
+        # serialization entirely
+        return orjson.dumps(
+            getattr(self, method)(**kwargs),
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
 
 # Global instance
 data_service = PromptDataService()
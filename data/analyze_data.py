@@ -4,7 +4,6 @@ Prompt Dataset Analysis Tool
 Analyzes the prompt datasets in the data directory
 """
 
-import json
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
@@ -12,33 +11,42 @@ from collections import Counter
 import statistics
 
 def load_jsonl(filepath):
-    """Load JSON Lines file into a list of dictionaries"""
-    data = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            data.append(json.loads(line.strip()))
-    return data
+    """Load a JSON Lines file straight into a DataFrame with pandas' C parser"""
+    # Keep values as stored: no date conversion or dtype coercion
+    return pd.read_json(filepath, lines=True, convert_dates=False, dtype=False)
 
 def analyze_dataset():
     """Analyze the prompt datasets and generate insights"""
     
     # Load datasets
     data_dir = Path(__file__).parent
-    prompts_data = load_jsonl(data_dir / 'prompts.jsonl')
-    recent_data = load_jsonl(data_dir / 'recent_prompts.jsonl')
+    prompts_df = load_jsonl(data_dir / 'prompts.jsonl')
+    recent_df = load_jsonl(data_dir / 'recent_prompts.jsonl')
     
     # Combine datasets
-    all_data = prompts_data + recent_data
-    df = pd.DataFrame(all_data)
+    df = pd.concat([prompts_df, recent_df], ignore_index=True)
+    
+    # Parse timestamps once; later min/max and hour lookups are on datetimes
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', utc=True, cache=True)
+    
+    # Low-cardinality labels as categoricals so counts and group-bys work on
+    # integer codes; categories keep first-seen order so ties list as before
+    for column in ('model', 'category'):
+        df[column] = df[column].astype(pd.CategoricalDtype(df[column].dropna().unique()))
+    
+    # Summary statistics, each column group aggregated in a single call
+    prompt_lengths = df['prompt'].str.len()
+    length_stats = prompt_lengths.agg(['mean', 'median', 'min', 'max'])
+    numeric_stats = df[['tokens_used', 'response_quality']].agg(['mean', 'sum', 'min', 'max'])
     
     print("=== PROMPT DATASET ANALYSIS ===\n")
     
     # Basic statistics
     print(f"📊 DATASET OVERVIEW")
-    print(f"Total prompts: {len(all_data)}")
+    print(f"Total prompts: {len(df)}")
     print(f"Unique users: {df['user'].nunique()}")
-    print(f"Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
-    print(f"Average prompt length: {df['prompt'].str.len().mean():.1f} characters")
+    print(f"Date range: {df['timestamp'].min():%Y-%m-%dT%H:%M:%SZ} to {df['timestamp'].max():%Y-%m-%dT%H:%M:%SZ}")
+    print(f"Average prompt length: {length_stats['mean']:.1f} characters")
     print()
     
     # Model usage
@@ -59,11 +67,12 @@ def analyze_dataset():
     
     # Quality metrics
     print(f"⭐ QUALITY METRICS")
-    print(f"Average response quality: {df['response_quality'].mean():.2f}/5.0")
-    print(f"Quality range: {df['response_quality'].min():.1f} - {df['response_quality'].max():.1f}")
+    quality_stats = numeric_stats['response_quality']
+    print(f"Average response quality: {quality_stats['mean']:.2f}/5.0")
+    print(f"Quality range: {quality_stats['min']:.1f} - {quality_stats['max']:.1f}")
     
     # Quality by model
-    quality_by_model = df.groupby('model')['response_quality'].mean().sort_values(ascending=False)
+    quality_by_model = df.groupby('model', observed=True)['response_quality'].mean().sort_values(ascending=False)
     print(f"\nQuality by model:")
     for model, quality in quality_by_model.items():
         print(f"  {model}: {quality:.2f}/5.0")
@@ -71,34 +80,38 @@ def analyze_dataset():
     
     # Token usage
     print(f"🔢 TOKEN USAGE")
-    print(f"Average tokens per prompt: {df['tokens_used'].mean():.0f}")
-    print(f"Total tokens used: {df['tokens_used'].sum():,}")
-    print(f"Token range: {df['tokens_used'].min()} - {df['tokens_used'].max()}")
+    token_stats = numeric_stats['tokens_used']
+    print(f"Average tokens per prompt: {token_stats['mean']:.0f}")
+    print(f"Total tokens used: {token_stats['sum']:,.0f}")
+    print(f"Token range: {token_stats['min']:.0f} - {token_stats['max']:.0f}")
     print()
     
     # Performance metrics (for recent data with extended metadata)
-    recent_df = pd.DataFrame(recent_data)
     if 'response_time_ms' in recent_df.columns:
         print(f"⚡ PERFORMANCE METRICS (Recent Data)")
-        print(f"Average response time: {recent_df['response_time_ms'].mean():.0f}ms")
-        print(f"Response time range: {recent_df['response_time_ms'].min()}ms - {recent_df['response_time_ms'].max()}ms")
+        time_stats = recent_df['response_time_ms'].agg(['mean', 'min', 'max'])
+        print(f"Average response time: {time_stats['mean']:.0f}ms")
+        print(f"Response time range: {time_stats['min']:.0f}ms - {time_stats['max']:.0f}ms")
         
         if 'cost_usd' in recent_df.columns:
-            print(f"Average cost per prompt: ${recent_df['cost_usd'].mean():.3f}")
-            print(f"Total cost: ${recent_df['cost_usd'].sum():.2f}")
+            cost_stats = recent_df['cost_usd'].agg(['mean', 'sum'])
+            print(f"Average cost per prompt: ${cost_stats['mean']:.3f}")
+            print(f"Total cost: ${cost_stats['sum']:.2f}")
         print()
     
     # Prompt length analysis
     print(f"📝 PROMPT LENGTH ANALYSIS")
-    prompt_lengths = df['prompt'].str.len()
-    print(f"Average length: {prompt_lengths.mean():.1f} characters")
-    print(f"Median length: {prompt_lengths.median():.1f} characters")
-    print(f"Length range: {prompt_lengths.min()} - {prompt_lengths.max()} characters")
-    
-    # Categorize by length
-    short_prompts = (prompt_lengths <= 50).sum()
-    medium_prompts = ((prompt_lengths > 50) & (prompt_lengths <= 150)).sum()
-    long_prompts = (prompt_lengths > 150).sum()
+    print(f"Average length: {length_stats['mean']:.1f} characters")
+    print(f"Median length: {length_stats['median']:.1f} characters")
+    print(f"Length range: {length_stats['min']:.0f} - {length_stats['max']:.0f} characters")
+    
+    # Categorize by length in one binning pass
+    length_counts = pd.cut(
+        prompt_lengths, [-1, 50, 150, float('inf')], labels=['short', 'medium', 'long']
+    ).value_counts()
+    short_prompts = length_counts['short']
+    medium_prompts = length_counts['medium']
+    long_prompts = length_counts['long']
     
     print(f"\nPrompt length distribution:")
     print(f"  Short (≤50 chars): {short_prompts} ({short_prompts/len(df)*100:.1f}%)")
@@ -112,12 +125,12 @@ def analyze_dataset():
         print(f"⚠️  LOW QUALITY PROMPTS ANALYSIS")
         print(f"Number of low quality responses: {len(poor_quality)}")
         print(f"Common characteristics:")
-        print(f"  Average prompt length: {poor_quality['prompt'].str.len().mean():.1f} characters")
+        print(f"  Average prompt length: {prompt_lengths[poor_quality.index].mean():.1f} characters")
         print(f"  Most common category: {poor_quality['category'].mode().iloc[0] if not poor_quality['category'].mode().empty else 'N/A'}")
         print()
     
     # Time-based analysis
-    df['hour'] = pd.to_datetime(df['timestamp']).dt.hour
+    df['hour'] = df['timestamp'].dt.hour
     print(f"🕐 USAGE PATTERNS")
     peak_hour = df['hour'].mode().iloc[0]
     print(f"Peak usage hour: {peak_hour}:00")
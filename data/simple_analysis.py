@@ -5,140 +5,260 @@ Analyzes the prompt datasets in the data directory
 """
 
 import json
+import mmap
+import os
 from datetime import datetime
 from pathlib import Path
 from collections import Counter, defaultdict
 
+try:
+    # orjson parses and writes JSON several times faster; the stdlib is the fallback
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    orjson = None
+    loads = json.loads
+
+def iter_jsonl(filepath):
+    """Yield records from a JSON Lines file one at a time"""
+    # Memory-map the file and slice out each line as bytes for the parser,
+    # skipping the per-line text decoding done by a regular file iterator
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            find = mm.find
+            pos = 0
+            end = len(mm)
+            while pos < end:
+                newline = find(b'\n', pos)
+                if newline < 0:
+                    newline = end
+                yield loads(mm[pos:newline])
+                pos = newline + 1
+
 def load_jsonl(filepath):
     """Load JSON Lines file into a list of dictionaries"""
-    data = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            data.append(json.loads(line.strip()))
-    return data
+    return list(iter_jsonl(filepath))
+
+class RunningStats:
+    """Count, sum, min and max of a stream of numbers"""
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+    
+    def add(self, value):
+        if self.count == 0:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+    
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
 
 def calculate_stats(numbers):
     """Calculate basic statistics for a list of numbers"""
     if not numbers:
         return {"mean": 0, "min": 0, "max": 0, "median": 0}
     
+    # One sort gives min, max and median; statistics.median would sort again
     numbers = sorted(numbers)
     n = len(numbers)
+    mid = n // 2
     
     return {
         "mean": sum(numbers) / n,
-        "min": min(numbers),
-        "max": max(numbers),
-        "median": numbers[n // 2] if n % 2 == 1 else (numbers[n//2 - 1] + numbers[n//2]) / 2
+        "min": numbers[0],
+        "max": numbers[-1],
+        "median": numbers[mid] if n % 2 == 1 else (numbers[mid - 1] + numbers[mid]) / 2
     }
 
-def analyze_simple():
+class DatasetStats:
+    """Aggregates over the combined datasets, updated one record at a time"""
+    
+    def __init__(self):
+        self.users = set()
+        self.first_timestamp = None
+        self.last_timestamp = None
+        # Raw values are kept only where a median is needed
+        self.prompt_lengths = []
+        self.qualities = []
+        self.tokens = []
+        self.length_stats = RunningStats()
+        self.short_prompts = 0
+        self.medium_prompts = 0
+        self.long_prompts = 0
+        self.quality_stats = RunningStats()
+        self.token_stats = RunningStats()
+        self.time_stats = RunningStats()
+        self.cost_total = 0
+        # Plain dicts count faster than Counter in the per-record loop;
+        # they are wrapped in a Counter when ranked
+        self.model_counts = {}
+        self.category_counts = {}
+        self.model_qualities = defaultdict(RunningStats)
+        self.poor_lengths = RunningStats()
+        self.poor_categories = {}
+        self.hour_counts = {}
+    
+    def add(self, item, is_recent=False):
+        """Fold one record into the aggregates"""
+        self.users.add(item['user'])
+        
+        timestamp = item['timestamp']
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+        
+        length = len(item['prompt'])
+        self.prompt_lengths.append(length)
+        self.length_stats.add(length)
+        if length <= 50:
+            self.short_prompts += 1
+        elif length <= 150:
+            self.medium_prompts += 1
+        else:
+            self.long_prompts += 1
+        
+        model = item['model']
+        quality = item['response_quality']
+        tokens = item['tokens_used']
+        category = item['category']
+        self.model_counts[model] = self.model_counts.get(model, 0) + 1
+        self.category_counts[category] = self.category_counts.get(category, 0) + 1
+        self.qualities.append(quality)
+        self.quality_stats.add(quality)
+        self.model_qualities[model].add(quality)
+        self.tokens.append(tokens)
+        self.token_stats.add(tokens)
+        
+        # Performance metrics only exist on recent data with extended metadata
+        if is_recent and 'response_time_ms' in item:
+            self.time_stats.add(item['response_time_ms'])
+            self.cost_total += item.get('cost_usd', 0)
+        
+        if quality < 3.0:
+            self.poor_lengths.add(length)
+            self.poor_categories[category] = self.poor_categories.get(category, 0) + 1
+        
+        # Timestamps are usually ISO 8601 (YYYY-MM-DDTHH:...), so the hour can
+        # be sliced out without building a datetime; anything else (e.g. a
+        # date-only value, which counts as hour 0) goes through the parser
+        digits = timestamp[11:13]
+        if (timestamp[10:11] in ('T', ' ') and digits.isascii()
+                and digits.isdigit() and int(digits) <= 23):
+            hour = int(digits)
+        else:
+            try:
+                hour = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).hour
+            except ValueError:
+                return
+        self.hour_counts[hour] = self.hour_counts.get(hour, 0) + 1
+
+def collect_stats(data_dir):
+    """Stream both datasets once into a DatasetStats"""
+    stats = DatasetStats()
+    for is_recent, filename in ((False, 'prompts.jsonl'), (True, 'recent_prompts.jsonl')):
+        for item in iter_jsonl(data_dir / filename):
+            stats.add(item, is_recent)
+    return stats
+
+def write_json(filepath, data):
+    """Write data as indented JSON"""
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2)
+
+def analyze_simple(stats=None):
     """Simple analysis without external dependencies"""
     
-    # Load datasets
     data_dir = Path(__file__).parent
     
     try:
-        prompts_data = load_jsonl(data_dir / 'prompts.jsonl')
-        recent_data = load_jsonl(data_dir / 'recent_prompts.jsonl')
+        if stats is None:
+            stats = collect_stats(data_dir)
     except FileNotFoundError as e:
         print(f"Error: Could not find data files: {e}")
         return
     
-    # Combine datasets
-    all_data = prompts_data + recent_data
+    total = stats.length_stats.count
     
     print("=== SIMPLE PROMPT DATASET ANALYSIS ===\n")
     
     # Basic statistics
     print(f"📊 DATASET OVERVIEW")
-    print(f"Total prompts: {len(all_data)}")
-    
-    users = set(item['user'] for item in all_data)
-    print(f"Unique users: {len(users)}")
-    
-    timestamps = [item['timestamp'] for item in all_data]
-    print(f"Date range: {min(timestamps)} to {max(timestamps)}")
-    
-    prompt_lengths = [len(item['prompt']) for item in all_data]
-    length_stats = calculate_stats(prompt_lengths)
-    print(f"Average prompt length: {length_stats['mean']:.1f} characters")
+    print(f"Total prompts: {total}")
+    print(f"Unique users: {len(stats.users)}")
+    print(f"Date range: {stats.first_timestamp} to {stats.last_timestamp}")
+    print(f"Average prompt length: {stats.length_stats.mean:.1f} characters")
     print()
     
     # Model usage
     print(f"🤖 MODEL USAGE")
-    model_counts = Counter(item['model'] for item in all_data)
-    for model, count in model_counts.most_common():
-        percentage = (count / len(all_data)) * 100
+    for model, count in Counter(stats.model_counts).most_common():
+        percentage = (count / total) * 100
         print(f"  {model}: {count} ({percentage:.1f}%)")
     print()
     
     # Category distribution
     print(f"📁 CATEGORY DISTRIBUTION")
-    category_counts = Counter(item['category'] for item in all_data)
-    for category, count in category_counts.most_common(10):
-        percentage = (count / len(all_data)) * 100
+    for category, count in Counter(stats.category_counts).most_common(10):
+        percentage = (count / total) * 100
         print(f"  {category}: {count} ({percentage:.1f}%)")
     print()
     
     # Quality metrics
-    qualities = [item['response_quality'] for item in all_data]
-    quality_stats = calculate_stats(qualities)
-    
     print(f"⭐ QUALITY METRICS")
-    print(f"Average response quality: {quality_stats['mean']:.2f}/5.0")
-    print(f"Quality range: {quality_stats['min']:.1f} - {quality_stats['max']:.1f}")
-    
-    # Quality by model
-    model_qualities = defaultdict(list)
-    for item in all_data:
-        model_qualities[item['model']].append(item['response_quality'])
+    print(f"Average response quality: {stats.quality_stats.mean:.2f}/5.0")
+    print(f"Quality range: {stats.quality_stats.min:.1f} - {stats.quality_stats.max:.1f}")
     
     print(f"\nQuality by model:")
-    for model, qualities in model_qualities.items():
-        avg_quality = sum(qualities) / len(qualities)
-        print(f"  {model}: {avg_quality:.2f}/5.0")
+    for model, qualities in stats.model_qualities.items():
+        print(f"  {model}: {qualities.mean:.2f}/5.0")
     print()
     
     # Token usage
-    tokens = [item['tokens_used'] for item in all_data]
-    token_stats = calculate_stats(tokens)
-    
     print(f"🔢 TOKEN USAGE")
-    print(f"Average tokens per prompt: {token_stats['mean']:.0f}")
-    print(f"Total tokens used: {sum(tokens):,}")
-    print(f"Token range: {token_stats['min']} - {token_stats['max']}")
+    print(f"Average tokens per prompt: {stats.token_stats.mean:.0f}")
+    print(f"Total tokens used: {stats.token_stats.total:,}")
+    print(f"Token range: {stats.token_stats.min} - {stats.token_stats.max}")
     print()
     
     # Performance metrics (for recent data with extended metadata)
-    recent_with_perf = [item for item in recent_data if 'response_time_ms' in item]
-    if recent_with_perf:
-        response_times = [item['response_time_ms'] for item in recent_with_perf]
-        time_stats = calculate_stats(response_times)
-        
+    if stats.time_stats.count:
         print(f"⚡ PERFORMANCE METRICS (Recent Data)")
-        print(f"Average response time: {time_stats['mean']:.0f}ms")
-        print(f"Response time range: {time_stats['min']}ms - {time_stats['max']}ms")
+        print(f"Average response time: {stats.time_stats.mean:.0f}ms")
+        print(f"Response time range: {stats.time_stats.min}ms - {stats.time_stats.max}ms")
         
-        costs = [item.get('cost_usd', 0) for item in recent_with_perf]
-        if any(costs):
-            cost_stats = calculate_stats(costs)
-            print(f"Average cost per prompt: ${cost_stats['mean']:.3f}")
-            print(f"Total cost: ${sum(costs):.2f}")
+        if stats.cost_total:
+            print(f"Average cost per prompt: ${stats.cost_total / stats.time_stats.count:.3f}")
+            print(f"Total cost: ${stats.cost_total:.2f}")
         print()
     
     # Prompt length analysis
+    median_length = calculate_stats(stats.prompt_lengths)['median']
     print(f"📝 PROMPT LENGTH ANALYSIS")
-    print(f"Average length: {length_stats['mean']:.1f} characters")
-    print(f"Median length: {length_stats['median']:.1f} characters")
-    print(f"Length range: {length_stats['min']} - {length_stats['max']} characters")
+    print(f"Average length: {stats.length_stats.mean:.1f} characters")
+    print(f"Median length: {median_length:.1f} characters")
+    print(f"Length range: {stats.length_stats.min} - {stats.length_stats.max} characters")
     
-    # Categorize by length
-    short_prompts = sum(1 for length in prompt_lengths if length <= 50)
-    medium_prompts = sum(1 for length in prompt_lengths if 50 < length <= 150)
-    long_prompts = sum(1 for length in prompt_lengths if length > 150)
+    # Categorize by length (counted during the streaming pass)
+    short_prompts = stats.short_prompts
+    medium_prompts = stats.medium_prompts
+    long_prompts = stats.long_prompts
     
-    total = len(prompt_lengths)
     print(f"\nPrompt length distribution:")
     print(f"  Short (≤50 chars): {short_prompts} ({short_prompts/total*100:.1f}%)")
     print(f"  Medium (51-150 chars): {medium_prompts} ({medium_prompts/total*100:.1f}%)")
@@ -146,36 +266,21 @@ def analyze_simple():
     print()
     
     # Poor quality prompts analysis
-    poor_quality = [item for item in all_data if item['response_quality'] < 3.0]
-    if poor_quality:
+    if stats.poor_lengths.count:
         print(f"⚠️  LOW QUALITY PROMPTS ANALYSIS")
-        print(f"Number of low quality responses: {len(poor_quality)}")
-        
-        poor_lengths = [len(item['prompt']) for item in poor_quality]
-        poor_categories = Counter(item['category'] for item in poor_quality)
+        print(f"Number of low quality responses: {stats.poor_lengths.count}")
         
         print(f"Common characteristics:")
-        if poor_lengths:
-            print(f"  Average prompt length: {sum(poor_lengths)/len(poor_lengths):.1f} characters")
-        if poor_categories:
-            most_common_cat = poor_categories.most_common(1)[0]
-            print(f"  Most common category: {most_common_cat[0]} ({most_common_cat[1]} occurrences)")
+        print(f"  Average prompt length: {stats.poor_lengths.mean:.1f} characters")
+        most_common_cat = Counter(stats.poor_categories).most_common(1)[0]
+        print(f"  Most common category: {most_common_cat[0]} ({most_common_cat[1]} occurrences)")
         print()
     
     # Time-based analysis
     print(f"🕐 USAGE PATTERNS")
     
-    # Extract hours from timestamps
-    hours = []
-    for item in all_data:
-        try:
-            dt = datetime.fromisoformat(item['timestamp'].replace('Z', '+00:00'))
-            hours.append(dt.hour)
-        except:
-            continue
-    
-    if hours:
-        hour_counts = Counter(hours)
+    if stats.hour_counts:
+        hour_counts = Counter(stats.hour_counts)
         peak_hour = hour_counts.most_common(1)[0][0]
         print(f"Peak usage hour: {peak_hour:02d}:00")
         
@@ -183,32 +288,30 @@ def analyze_simple():
         for hour, count in hour_counts.most_common(5):
             print(f"  {hour:02d}:00 - {count} prompts")
 
-def export_summary():
+def export_summary(stats=None):
     """Export a summary to JSON"""
     data_dir = Path(__file__).parent
     
     try:
-        prompts_data = load_jsonl(data_dir / 'prompts.jsonl')
-        recent_data = load_jsonl(data_dir / 'recent_prompts.jsonl')
-        all_data = prompts_data + recent_data
+        if stats is None:
+            stats = collect_stats(data_dir)
         
         summary = {
             "generated_at": datetime.now().isoformat(),
-            "total_prompts": len(all_data),
-            "unique_users": len(set(item['user'] for item in all_data)),
+            "total_prompts": stats.length_stats.count,
+            "unique_users": len(stats.users),
             "date_range": {
-                "start": min(item['timestamp'] for item in all_data),
-                "end": max(item['timestamp'] for item in all_data)
+                "start": stats.first_timestamp,
+                "end": stats.last_timestamp
             },
-            "models": dict(Counter(item['model'] for item in all_data)),
-            "categories": dict(Counter(item['category'] for item in all_data)),
-            "quality_stats": calculate_stats([item['response_quality'] for item in all_data]),
-            "token_stats": calculate_stats([item['tokens_used'] for item in all_data]),
-            "prompt_length_stats": calculate_stats([len(item['prompt']) for item in all_data])
+            "models": dict(stats.model_counts),
+            "categories": dict(stats.category_counts),
+            "quality_stats": calculate_stats(stats.qualities),
+            "token_stats": calculate_stats(stats.tokens),
+            "prompt_length_stats": calculate_stats(stats.prompt_lengths)
         }
         
-        with open(data_dir / 'analysis_summary.json', 'w') as f:
-            json.dump(summary, f, indent=2)
+        write_json(data_dir / 'analysis_summary.json', summary)
         
         print("📄 Analysis summary exported to 'analysis_summary.json'")
         
@@ -217,9 +320,16 @@ def export_summary():
 
 def main():
     """Main function"""
-    analyze_simple()
+    # Read the datasets once for both the report and the export; if the files
+    # are missing each step reports it as before
+    try:
+        stats = collect_stats(Path(__file__).parent)
+    except FileNotFoundError:
+        stats = None
+    
+    analyze_simple(stats)
     print("\n" + "="*50)
-    export_summary()
+    export_summary(stats)
 
 if __name__ == "__main__":
     main()
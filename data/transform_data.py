@@ -5,12 +5,59 @@ to comply with the schema.
 """
 
 import json
+import multiprocessing
+import os
 import sys
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
+
+try:
+    # orjson parses and serializes JSON Lines several times faster than json
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    orjson = None
+    loads = json.loads
+
+# Input field -> (output field, DataTransformer method applied to the value),
+# in output order; session_id is generated after these
+FIELD_MAP = (
+    ("prompt", "prompt", None),
+    ("user_name", "user", None),
+    ("user_id", "user_id", "transform_user_id"),
+    ("timestamp", "timestamp", None),
+    ("model_used", "model", "map_model_name"),
+    ("category", "category", "transform_category"),
+    ("tokens_used", "tokens_used", None),
+    ("quality_score", "response_quality", None),
+)
+
+# Optional input field -> output field, copied after session_id
+OPTIONAL_FIELD_MAP = (
+    ("prompt_length", "prompt_length"),
+    ("response_time", "response_time_ms"),
+    ("cost", "cost_usd"),
+)
+
+# Output buffer size; large enough that writes reach the OS in big batches
+# instead of one small write per few records
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Stands in for a field that is absent from a record
+MISSING = object()
+
+
+def dump_line(record: Dict[str, Any]) -> bytes:
+    """Serialize a record as one UTF-8 JSON line, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    ).encode("utf-8")
 
 
 class DataTransformer:
-    def __init__(self):
+    def __init__(self, first_session: int = 1):
         """Initialize the transformer with category mappings."""
         # Mapping from Japanese categories to English schema categories
         self.category_mapping = {
@@ -31,7 +78,11 @@ class DataTransformer:
         }
 
         # Counter for generating session IDs
-        self.session_counter = 1
+        self.session_counter = first_session
+
+        # transform_record is generated from the field maps, so each record
+        # runs straight-line code instead of looping over the mapping
+        self.transform_record = self.compile_transform()
 
     def transform_user_id(self, user_id: str) -> str:
         """Transform user_id from u_XXX format to usr_XXX format."""
@@ -64,58 +115,38 @@ class DataTransformer:
         }
         return model_mapping.get(model_used, "gpt-4")  # Default to gpt-4 if unknown
 
-    def transform_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
-        """Transform a single record to comply with the schema."""
-        transformed = {}
-
-        # Copy basic fields that match the schema
-        if "prompt" in record:
-            transformed["prompt"] = record["prompt"]
-
-        # Transform user_name to user
-        if "user_name" in record:
-            transformed["user"] = record["user_name"]
-
-        # Transform user_id format
-        if "user_id" in record:
-            transformed["user_id"] = self.transform_user_id(record["user_id"])
-
-        # Copy timestamp as-is
-        if "timestamp" in record:
-            transformed["timestamp"] = record["timestamp"]
-
-        # Transform model_used to model
-        if "model_used" in record:
-            transformed["model"] = self.map_model_name(record["model_used"])
-
-        # Transform category
-        if "category" in record:
-            transformed["category"] = self.transform_category(record["category"])
-
-        # Copy tokens_used as-is
-        if "tokens_used" in record:
-            transformed["tokens_used"] = record["tokens_used"]
-
-        # Transform quality_score to response_quality
-        if "quality_score" in record:
-            transformed["response_quality"] = record["quality_score"]
-
+    def compile_transform(self) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Generate a record transform function with the field maps inlined."""
+        namespace = {
+            "MISSING": MISSING,
+            "generate_session_id": self.generate_session_id,
+        }
+        lines = [
+            "def transform_record(record):",
+            '    """Transform a single record to comply with the schema."""',
+            "    transformed = {}",
+        ]
+
+        def copy_field(source: str, target: str, method: Optional[str] = None) -> None:
+            lines.append(f"    value = record.get({source!r}, MISSING)")
+            lines.append("    if value is not MISSING:")
+            if method:
+                namespace[method] = getattr(self, method)
+                value = f"{method}(value)"
+            else:
+                value = "value"
+            lines.append(f"        transformed[{target!r}] = {value}")
+
+        for source, target, method in FIELD_MAP:
+            copy_field(source, target, method)
         # Generate session_id (required field that's missing)
-        transformed["session_id"] = self.generate_session_id()
-
-        # Add optional fields if they exist and map them correctly
-        if "prompt_length" in record:
-            transformed["prompt_length"] = record["prompt_length"]
+        lines.append('    transformed["session_id"] = generate_session_id()')
+        for source, target in OPTIONAL_FIELD_MAP:
+            copy_field(source, target)
+        lines.append("    return transformed")
 
-        # Map response_time to response_time_ms
-        if "response_time" in record:
-            transformed["response_time_ms"] = record["response_time"]
-
-        # Map cost to cost_usd
-        if "cost" in record:
-            transformed["cost_usd"] = record["cost"]
-
-        return transformed
+        exec("\n".join(lines), namespace)
+        return namespace["transform_record"]
 
     def transform_file(self, input_file: str, output_file: str) -> Dict[str, Any]:
         """Transform an entire file."""
@@ -129,21 +160,20 @@ class DataTransformer:
 
         try:
             with open(input_file, "r", encoding="utf-8") as infile:
-                with open(output_file, "w", encoding="utf-8") as outfile:
+                with open(output_file, "wb", buffering=WRITE_BUFFER_SIZE) as outfile:
                     for line_num, line in enumerate(infile, 1):
                         line = line.strip()
                         if not line:
                             continue
 
                         try:
-                            record = json.loads(line)
+                            record = loads(line)
                             results["records_processed"] += 1
 
                             transformed_record = self.transform_record(record)
 
                             # Write the transformed record
-                            json.dump(transformed_record, outfile, ensure_ascii=False)
-                            outfile.write("\n")
+                            outfile.write(dump_line(transformed_record))
 
                             results["records_transformed"] += 1
 
@@ -162,6 +192,21 @@ class DataTransformer:
         return results
 
 
+def count_records(input_file: str) -> int:
+    """Count the non-blank lines of a JSONL file (0 if it cannot be read)."""
+    try:
+        with open(input_file, "rb") as infile:
+            return sum(1 for line in infile if line.strip())
+    except OSError:
+        return 0
+
+
+def transform_file_worker(args) -> Dict[str, Any]:
+    """Transform one file in a worker process with its own session ID range."""
+    input_file, output_file, first_session = args
+    return DataTransformer(first_session).transform_file(input_file, output_file)
+
+
 def main():
     """Main transformation function."""
     files_to_transform = [
@@ -172,7 +217,18 @@ def main():
     print("🔧 Transforming expanded prompt files to comply with schema...")
     print("=" * 70)
 
-    transformer = DataTransformer()
+    # Files are transformed in parallel; each worker numbers its sessions from
+    # where the previous files' records end so session IDs stay unique
+    jobs = []
+    first_session = 1
+    for input_file, output_file in files_to_transform:
+        jobs.append((input_file, output_file, first_session))
+        first_session += count_records(input_file)
+
+    processes = min(len(jobs), os.cpu_count() or 1)
+    with multiprocessing.Pool(processes=processes) as pool:
+        all_results = pool.map(transform_file_worker, jobs)
+
     overall_results = {
         "total_files": 0,
         "successful_files": 0,
@@ -180,11 +236,10 @@ def main():
         "transformed_records": 0,
     }
 
-    for input_file, output_file in files_to_transform:
+    for (input_file, output_file), results in zip(files_to_transform, all_results):
         print(f"\n📄 Transforming: {input_file} → {output_file}")
         print("-" * 50)
 
-        results = transformer.transform_file(input_file, output_file)
         overall_results["total_files"] += 1
         overall_results["total_records"] += results["records_processed"]
         overall_results["transformed_records"] += results["records_transformed"]
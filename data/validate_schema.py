@@ -7,9 +7,67 @@ Validates JSONL files against the defined schema.
 import json
 import sys
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import re
 import os
+import multiprocessing
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+# Files are only split for parallel validation once each piece would be at
+# least this large; below that, process start-up costs more than it saves
+MIN_CHUNK_BYTES = 1 << 20
+
+# Precompiled format patterns
+USER_ID_RE = re.compile(r"^usr_\d{3}$")
+SESSION_ID_RE = re.compile(r"^sess_[a-zA-Z0-9]{6}$")
+# Timestamps that are valid on any calendar (days up to 28, no fraction or
+# offset); anything else falls back to datetime.fromisoformat
+SIMPLE_TIMESTAMP_RE = re.compile(
+    r"(?!0000)[0-9]{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|1[0-9]|2[0-8])"
+    r"T(?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9]Z?"
+)
+
+
+def is_iso_timestamp(value: str) -> bool:
+    """Check an ISO 8601 timestamp, parsing it only when the regex can't decide."""
+    if SIMPLE_TIMESTAMP_RE.fullmatch(value):
+        return True
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+# Schema type name -> accepted Python types
+TYPE_MAPPING = {"string": str, "integer": int, "number": (int, float)}
+
+# Format name -> (check, error message suffix)
+FORMAT_VALIDATORS = {
+    "usr_XXX": (USER_ID_RE.match, "doesn't match format 'usr_XXX'"),
+    "sess_XXXXXX": (SESSION_ID_RE.match, "doesn't match format 'sess_XXXXXX'"),
+    "YYYY-MM-DDTHH:mm:ssZ": (is_iso_timestamp, "doesn't match ISO 8601 format"),
+}
+
+# Stands in for a field that is absent from a record
+MISSING = object()
+
+
+class ValidationContext:
+    """Errors, warnings and record counts gathered while validating a file."""
+
+    __slots__ = ("errors", "warnings", "total", "valid", "invalid")
+
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+        self.total = 0
+        self.valid = 0
+        self.invalid = 0
 
 
 class SchemaValidator:
@@ -18,172 +76,299 @@ class SchemaValidator:
         with open(schema_path, "r") as f:
             self.schema = json.load(f)
         self.fields = self.schema["fields"]
+        self.schema_fields = set(self.fields)
         self.errors = []
         self.warnings = []
 
+        # Resolve each field spec once into (name, required, type, checks) so
+        # validate_record doesn't re-read the spec dicts for every record
+        self.field_checks = [
+            (
+                field_name,
+                field_spec.get("required", False),
+                TYPE_MAPPING.get(field_spec["type"]),
+                self.compile_checks(field_spec),
+            )
+            for field_name, field_spec in self.fields.items()
+        ]
+
+    def compile_checks(
+        self, field_spec: Dict
+    ) -> List[Callable[[Any, str, List[str]], bool]]:
+        """Build the enum, format and range checks that apply to a field."""
+        checks = []
+        python_type = TYPE_MAPPING.get(field_spec["type"])
+
+        if "enum" in field_spec:
+            enum_values = field_spec["enum"]
+            # Typed string fields are hashable, so membership can use a set
+            allowed = frozenset(enum_values) if python_type is str else enum_values
+
+            def check_enum(value: Any, field_name: str, errors: List[str]) -> bool:
+                return value in allowed or self.validate_enum(
+                    value, enum_values, field_name, errors
+                )
+
+            checks.append(check_enum)
+
+        if field_spec.get("format") in FORMAT_VALIDATORS:
+            check, message = FORMAT_VALIDATORS[field_spec["format"]]
+
+            def check_format(value: Any, field_name: str, errors: List[str]) -> bool:
+                if not isinstance(value, str) or check(value):
+                    return True
+                errors.append(f"Field '{field_name}': '{value}' {message}")
+                return False
+
+            checks.append(check_format)
+
+        if field_spec["type"] in ["integer", "number"]:
+            minimum = field_spec.get("minimum")
+            maximum = field_spec.get("maximum")
+
+            def check_range(value: Any, field_name: str, errors: List[str]) -> bool:
+                if (minimum is None or value >= minimum) and (
+                    maximum is None or value <= maximum
+                ):
+                    return True
+                return self.validate_range(value, field_spec, field_name, errors)
+
+            checks.append(check_range)
+
+        return checks
+
     def validate_field_type(
-        self, value: Any, expected_type: str, field_name: str
+        self,
+        value: Any,
+        expected_type: str,
+        field_name: str,
+        errors: Optional[List[str]] = None,
     ) -> bool:
         """Validate field type."""
-        type_mapping = {"string": str, "integer": int, "number": (int, float)}
-
-        expected_python_type = type_mapping.get(expected_type)
+        expected_python_type = TYPE_MAPPING.get(expected_type)
         if expected_python_type and not isinstance(value, expected_python_type):
-            self.errors.append(
+            (self.errors if errors is None else errors).append(
                 f"Field '{field_name}': expected {expected_type}, got {type(value).__name__}"
             )
             return False
         return True
 
     def validate_enum(
-        self, value: Any, enum_values: List[str], field_name: str
+        self,
+        value: Any,
+        enum_values: List[str],
+        field_name: str,
+        errors: Optional[List[str]] = None,
     ) -> bool:
         """Validate enum values."""
         if value not in enum_values:
-            self.errors.append(
+            (self.errors if errors is None else errors).append(
                 f"Field '{field_name}': '{value}' not in allowed values {enum_values}"
             )
             return False
         return True
 
-    def validate_format(self, value: str, format_spec: str, field_name: str) -> bool:
+    def validate_format(
+        self,
+        value: str,
+        format_spec: str,
+        field_name: str,
+        errors: Optional[List[str]] = None,
+    ) -> bool:
         """Validate field format."""
-        if format_spec == "usr_XXX":
-            if not re.match(r"^usr_\d{3}$", value):
-                self.errors.append(
-                    f"Field '{field_name}': '{value}' doesn't match format 'usr_XXX'"
-                )
-                return False
-        elif format_spec == "sess_XXXXXX":
-            if not re.match(r"^sess_[a-zA-Z0-9]{6}$", value):
-                self.errors.append(
-                    f"Field '{field_name}': '{value}' doesn't match format 'sess_XXXXXX'"
-                )
-                return False
-        elif format_spec == "YYYY-MM-DDTHH:mm:ssZ":
-            try:
-                datetime.fromisoformat(value.replace("Z", "+00:00"))
-            except ValueError:
-                self.errors.append(
-                    f"Field '{field_name}': '{value}' doesn't match ISO 8601 format"
-                )
-                return False
+        validator = FORMAT_VALIDATORS.get(format_spec)
+        if validator is None:
+            return True
+        check, message = validator
+        if not check(value):
+            (self.errors if errors is None else errors).append(
+                f"Field '{field_name}': '{value}' {message}"
+            )
+            return False
         return True
 
-    def validate_range(self, value: Any, field_spec: Dict, field_name: str) -> bool:
+    def validate_range(
+        self,
+        value: Any,
+        field_spec: Dict,
+        field_name: str,
+        errors: Optional[List[str]] = None,
+    ) -> bool:
         """Validate numeric ranges."""
+        if errors is None:
+            errors = self.errors
         if "minimum" in field_spec and value < field_spec["minimum"]:
-            self.errors.append(
+            errors.append(
                 f"Field '{field_name}': {value} is below minimum {field_spec['minimum']}"
             )
             return False
         if "maximum" in field_spec and value > field_spec["maximum"]:
-            self.errors.append(
+            errors.append(
                 f"Field '{field_name}': {value} is above maximum {field_spec['maximum']}"
             )
             return False
         return True
 
-    def validate_record(self, record: Dict, record_num: int) -> bool:
-        """Validate a single record against the schema."""
+    def validate_record(
+        self,
+        record: Dict,
+        record_num: int,
+        ctx: Optional[ValidationContext] = None,
+    ) -> bool:
+        """Validate a single record, reporting into ctx (or self.errors/warnings)."""
+        errors = self.errors if ctx is None else ctx.errors
+        warnings = self.warnings if ctx is None else ctx.warnings
         record_valid = True
         record_errors = []
 
-        # Check required fields
-        for field_name, field_spec in self.fields.items():
-            if field_spec.get("required", False) and field_name not in record:
-                record_errors.append(f"Missing required field '{field_name}'")
-                record_valid = False
+        for field_name, required, python_type, checks in self.field_checks:
+            value = record.get(field_name, MISSING)
+            if value is MISSING:
+                if required:
+                    record_errors.append(f"Missing required field '{field_name}'")
+                    record_valid = False
                 continue
 
-            if field_name not in record:
-                continue  # Optional field not present
-
-            value = record[field_name]
-
             # Type validation
-            if not self.validate_field_type(value, field_spec["type"], field_name):
+            if python_type is not None and not isinstance(value, python_type):
+                expected_type = self.fields[field_name]["type"]
+                self.validate_field_type(value, expected_type, field_name, errors)
                 record_valid = False
                 continue
 
-            # Enum validation
-            if "enum" in field_spec:
-                if not self.validate_enum(value, field_spec["enum"], field_name):
-                    record_valid = False
-
-            # Format validation
-            if "format" in field_spec and isinstance(value, str):
-                if not self.validate_format(value, field_spec["format"], field_name):
-                    record_valid = False
-
-            # Range validation for numbers
-            if field_spec["type"] in ["integer", "number"]:
-                if not self.validate_range(value, field_spec, field_name):
+            # Enum, format and range validation
+            for check in checks:
+                if not check(value, field_name, errors):
                     record_valid = False
 
         # Check for unexpected fields (not in schema)
-        schema_fields = set(self.fields.keys())
-        record_fields = set(record.keys())
-        unexpected_fields = record_fields - schema_fields
+        unexpected_fields = set(record.keys()) - self.schema_fields
 
         if unexpected_fields:
-            self.warnings.append(
+            warnings.append(
                 f"Record {record_num}: Unexpected fields found: {unexpected_fields}"
             )
 
         if record_errors:
             for error in record_errors:
-                self.errors.append(f"Record {record_num}: {error}")
+                errors.append(f"Record {record_num}: {error}")
 
         return record_valid
 
-    def validate_file(self, file_path: str) -> Dict[str, Any]:
-        """Validate a JSONL file."""
-        results = {
-            "file": file_path,
-            "total_records": 0,
-            "valid_records": 0,
-            "invalid_records": 0,
-            "errors": [],
-            "warnings": [],
-        }
+    def validate_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        first_line: int = 1,
+    ) -> Dict[str, Any]:
+        """Validate a JSONL file, or the lines in its [start, end) byte range."""
+        ctx = ValidationContext()
 
         if not os.path.exists(file_path):
-            results["errors"].append(f"File not found: {file_path}")
-            return results
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                for i, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        record = json.loads(line)
-                        results["total_records"] += 1
-
-                        # Reset errors and warnings for this record
-                        self.errors = []
-                        self.warnings = []
-
-                        if self.validate_record(record, i):
-                            results["valid_records"] += 1
-                        else:
-                            results["invalid_records"] += 1
+            ctx.errors.append(f"File not found: {file_path}")
+        else:
+            try:
+                self.validate_lines(file_path, start, end, first_line, ctx)
+            except Exception as e:
+                ctx.errors.append(f"Error reading file: {str(e)}")
 
-                        # Collect errors and warnings
-                        results["errors"].extend(self.errors)
-                        results["warnings"].extend(self.warnings)
+        return {
+            "file": file_path,
+            "total_records": ctx.total,
+            "valid_records": ctx.valid,
+            "invalid_records": ctx.invalid,
+            "errors": ctx.errors,
+            "warnings": ctx.warnings,
+        }
 
-                    except json.JSONDecodeError as e:
-                        results["errors"].append(f"Line {i}: Invalid JSON - {str(e)}")
-                        results["invalid_records"] += 1
+    def validate_lines(
+        self,
+        file_path: str,
+        start: int,
+        end: Optional[int],
+        first_line: int,
+        ctx: ValidationContext,
+    ) -> None:
+        """Validate the records in a byte range of a JSONL file into ctx."""
+        with open(file_path, "rb") as f:
+            f.seek(start)
+            position = start
+            for i, line in enumerate(f, first_line):
+                if end is not None and position >= end:
+                    break
+                position += len(line)
+
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    record = loads(line)
+                except json.JSONDecodeError as e:
+                    ctx.errors.append(f"Line {i}: Invalid JSON - {str(e)}")
+                    ctx.invalid += 1
+                    continue
+
+                ctx.total += 1
+                if self.validate_record(record, i, ctx):
+                    ctx.valid += 1
+                else:
+                    ctx.invalid += 1
+
+
+def split_jsonl_ranges(file_path: str, n_chunks: int) -> List[Tuple[int, int, int]]:
+    """Split a JSONL file into (start, end, first_line) ranges on line boundaries."""
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        bounds = [0]
+        for k in range(1, n_chunks):
+            f.seek(size * k // n_chunks)
+            f.readline()  # Snap forward to the start of the next record
+            offset = f.tell()
+            if bounds[-1] < offset < size:
+                bounds.append(offset)
+        bounds.append(size)
+
+        # Line numbers for error messages: count newlines ahead of each range
+        ranges = []
+        line_num = 1
+        f.seek(0)
+        for start, end in zip(bounds, bounds[1:]):
+            ranges.append((start, end, line_num))
+            remaining = end - start
+            while remaining:
+                block = f.read(min(remaining, MIN_CHUNK_BYTES))
+                line_num += block.count(b"\n")
+                remaining -= len(block)
+        return ranges
+
+
+def merge_results(
+    file_path: str, chunk_results: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Combine the results of a file's ranges, keeping errors in line order."""
+    results = {
+        "file": file_path,
+        "total_records": 0,
+        "valid_records": 0,
+        "invalid_records": 0,
+        "errors": [],
+        "warnings": [],
+    }
+    for chunk in chunk_results:
+        results["total_records"] += chunk["total_records"]
+        results["valid_records"] += chunk["valid_records"]
+        results["invalid_records"] += chunk["invalid_records"]
+        results["errors"].extend(chunk["errors"])
+        results["warnings"].extend(chunk["warnings"])
+    return results
 
-        except Exception as e:
-            results["errors"].append(f"Error reading file: {str(e)}")
 
-        return results
+def validate_file_worker(args) -> Dict[str, Any]:
+    """Validate one file range in a worker process with its own validator."""
+    schema_path, file_path, start, end, first_line = args
+    return SchemaValidator(schema_path).validate_file(file_path, start, end, first_line)
 
 
 def main():
@@ -200,8 +385,33 @@ def main():
     print("🔍 Validating prompt analyzer data against schema...")
     print("=" * 60)
 
-    # Initialize validator
-    validator = SchemaValidator(schema_path)
+    # Validate in parallel, splitting large files into byte ranges on record
+    # boundaries; workers build their own validator since it keeps
+    # per-record error state
+    cpus = os.cpu_count() or 1
+    jobs = []
+    chunk_counts = []
+    for file_path in data_files:
+        if os.path.exists(file_path):
+            size = os.path.getsize(file_path)
+            ranges = split_jsonl_ranges(
+                file_path, max(1, min(cpus, size // MIN_CHUNK_BYTES))
+            )
+        else:
+            ranges = [(0, None, 1)]  # validate_file reports the missing file
+        jobs.extend((schema_path, file_path, *r) for r in ranges)
+        chunk_counts.append(len(ranges))
+
+    with multiprocessing.Pool(processes=min(len(jobs), cpus)) as pool:
+        chunk_results = pool.map(validate_file_worker, jobs)
+
+    all_results = []
+    offset = 0
+    for file_path, count in zip(data_files, chunk_counts):
+        all_results.append(
+            merge_results(file_path, chunk_results[offset : offset + count])
+        )
+        offset += count
 
     overall_results = {
         "total_files": 0,
@@ -212,11 +422,10 @@ def main():
     }
 
     # Validate each file
-    for file_path in data_files:
+    for file_path, results in zip(data_files, all_results):
         print(f"\n📄 Validating: {os.path.basename(file_path)}")
         print("-" * 40)
 
-        results = validator.validate_file(file_path)
         overall_results["total_files"] += 1
         overall_results["total_records"] += results["total_records"]
         overall_results["valid_records"] += results["valid_records"]